@@ -1,19 +1,31 @@
 # -*- coding: UTF-8 -*-
 
+# Pillow, rich.progress/markdown et les modules d'extraction (Numba) sont
+# importés paresseusement dans les fonctions qui les utilisent : seuls la
+# console et le panneau d'en-tête sont nécessaires avant le premier prompt
+from __future__ import annotations
+
+import functools
+import multiprocessing
 import os
+import re
+import shlex
+from concurrent.futures import ProcessPoolExecutor
 from math import ceil
-from PIL import Image, ImageDraw, ImageFont
+import numpy as np
 import configparser
-from Pylette import extract_colors, Palette
 from rich.console import Console, JustifyMethod
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn
-from rich.markdown import Markdown
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 from modules.image_selector import select_images
 from modules.export import Exporter, ExportToJSon, ExportToCSV, ExportToGPL, ExportToACO
 
+if TYPE_CHECKING:
+    from PIL import Image
+    from modules.kmeans import ColorPalette
+
 console = Console()
 
 # Configuration
@@ -26,25 +38,45 @@ BASEDIR = os.path.dirname(os.path.abspath(__file__))
 config_user = configparser.ConfigParser()
 config_user.read(f"{BASEDIR}/config.ini")
 
+def parse_bool(value: str) -> bool:
+    return configparser.ConfigParser.BOOLEAN_STATES.get(value.lower(), False)
+
+def parse_resize(value: str) -> int:
+    """Taille cible (bord long, en pixels) du rééchantillonnage avant clustering.
+    Accepte les anciennes valeurs booléennes (True -> 256, False -> 0)."""
+    try:
+        return int(value)
+    except ValueError:
+        return 256 if parse_bool(value) else 0
+
+# Champ de configuration -> (conversion, valeur par défaut)
+CONFIG_SCHEMA = {
+    "palette_size": (int, 9),
+    "square_x": (int, 100),
+    "square_y": (int, 100),
+    "columns": (int, 3),
+    "title_size": (int, 18),
+    "subtitle_size": (int, 14),
+    "title_font": (str, "Lato-Black.ttf"),
+    "subtitle_font": (str, "Lato-Regular.ttf"),
+    "resize": (parse_resize, 256),
+    "algorithm": (str, "quantize"),
+    "clear_console": (parse_bool, True),
+    "save_path": (str, os.path.join(BASEDIR, "output")),
+}
+
+# Lecture de la section en une seule passe au lieu d'un getint/get par clé
+config_section = config_user["palette"] if config_user.has_section("palette") else {}
 config = {
     "palette": {
-        "palette_size": config_user.getint('palette', 'palette_size', fallback=9),
-        "square_x": config_user.getint('palette', 'square_x', fallback=100),
-        "square_y": config_user.getint('palette', 'square_y', fallback=100),
-        "columns": config_user.getint('palette', 'columns', fallback=3),
-        "title_size": config_user.getint('palette', 'title_size', fallback=18),
-        "subtitle_size": config_user.getint('palette', 'subtitle_size', fallback=14),
-        "title_font": config_user.get('palette', 'title_font', fallback="Lato-Black.ttf"),
-        "subtitle_font": config_user.get('palette', 'subtitle_font', fallback="Lato-Regular.ttf"),
-        "resize": config_user.getboolean('palette', 'resize', fallback=True),
-        "clear_console": config_user.getboolean('palette', 'clear_console', fallback=True),
-        "save_path": config_user.get('palette', 'save_path', fallback=os.path.join(BASEDIR, "output")),
+        key: cast(config_section[key]) if key in config_section else default
+        for key, (cast, default) in CONFIG_SCHEMA.items()
     }
 }
 
 @dataclass
 class PaletteObject():
-    palette: Palette
+    palette: ColorPalette
     image_path: str
     palette_path: str
 
@@ -75,23 +107,82 @@ def get_image_info(image_path: str) -> tuple[str, str]:
 
     return dirname, image_name
 
-def get_palette(image_path: str) -> tuple[Palette, list]:
-    palette = extract_colors(
-        image=image_path, 
-        palette_size=config["palette"]["palette_size"], 
-        sort_mode='luminance', 
-        resize=config["palette"]["resize"]
+def load_image_pixels(image_path: str, resize: int) -> np.ndarray:
+    """Décode l'image une seule fois en tableau (N, 3) uint8.
+    draft() laisse libjpeg décoder les JPEG directement à l'échelle réduite."""
+    from PIL import Image
+
+    with Image.open(image_path) as img:
+        if resize:
+            img.draft('RGB', (resize, resize))
+        img = img.convert('RGB')
+        # Sous-échantillonnage : la qualité de la palette sature bien avant
+        # la résolution native, le clustering devient quasi instantané
+        if resize:
+            img.thumbnail((resize, resize), Image.Resampling.BILINEAR)
+        return np.asarray(img, dtype=np.uint8).reshape(-1, 3)
+
+def get_palette(image_path: str, pixels: np.ndarray | None=None) -> tuple[ColorPalette, list]:
+    resize = config["palette"]["resize"]
+    palette_size = config["palette"]["palette_size"]
+    algorithm = config["palette"]["algorithm"]
+
+    from modules.cache import load_or_compute
+    from modules.kmeans import kmeans_palette_from_pixels, quantize_palette_from_pixels
+
+    def compute() -> ColorPalette:
+        decoded = pixels if pixels is not None else load_image_pixels(image_path, resize)
+        if algorithm == "kmeans":
+            return kmeans_palette_from_pixels(pixels=decoded, k=palette_size)
+        return quantize_palette_from_pixels(pixels=decoded, k=palette_size)
+
+    palette = load_or_compute(
+        image_path=image_path,
+        palette_size=palette_size,
+        resize=resize,
+        algorithm=algorithm,
+        compute_fn=compute
     )
     palette_rgb = palette_to_rgb(palette=palette)
-    return palette, palette_rgb 
+    return palette, palette_rgb
+
+def palette_to_rgb(palette: ColorPalette) -> np.ndarray:
+    return np.asarray([color.rgb for color in palette], dtype=np.uint8)
 
-def palette_to_rgb(palette: Palette) -> list:
-    return [tuple(color.rgb) for color in palette]
+# Table de correspondance 0-255 -> "00"-"FF" pour la conversion vectorisée
+HEX2 = np.array([f"{i:02X}" for i in range(256)])
+
+def rgb_to_hex_batch(rgb_array: np.ndarray) -> np.ndarray:
+    """Convertit un tableau (N, 3) uint8 en N chaînes '#RRGGBB' d'un coup."""
+    arr = np.asarray(rgb_array, dtype=np.uint8)
+    return np.char.add(
+        np.char.add(np.char.add("#", HEX2[arr[:, 0]]), HEX2[arr[:, 1]]),
+        HEX2[arr[:, 2]]
+    )
+
+def palette_to_rgb_hex(palette: ColorPalette) -> tuple[np.ndarray, list]:
+    """Une seule passe sur les couleurs : tableau RGB et chaînes hexadécimales."""
+    palette_rgb = palette_to_rgb(palette=palette)
+    return palette_rgb, rgb_to_hex_batch(palette_rgb).tolist()
 
 def convert_rgb_to_hex(rgb: tuple) -> str:
-    return ('#%02x%02x%02x' % rgb).upper()
+    """Pendant scalaire de rgb_to_hex_batch pour une couleur isolée."""
+    return '#' + bytes(rgb).hex().upper()
+
+@functools.lru_cache(maxsize=16)
+def _get_font(path: str, size: int):
+    """Charge une police une seule fois par session (parsing FreeType coûteux)."""
+    from PIL import ImageFont
+
+    return ImageFont.truetype(path, size)
+
+@functools.lru_cache(maxsize=1024)
+def _get_text_length(font, text: str) -> float:
+    return font.getlength(text)
+
+def create_palette_image(palette: ColorPalette, palette_rgb: list, image_path: str) -> Image.Image:
+    from PIL import Image, ImageDraw, ImageFont
 
-def create_palette_image(palette: Palette, palette_rgb: list, image_path: str) -> Image.Image:
     # Configuration
     square_x = config["palette"]['square_x']
     square_y = config["palette"]['square_y']
@@ -106,58 +197,63 @@ def create_palette_image(palette: Palette, palette_rgb: list, image_path: str) -
     image_width = columns * square_x
     image_height = lines * square_y
     
-    image = Image.new('RGB', (image_width, image_height), 'white')
-    draw = ImageDraw.Draw(image)
-    
-    # Chargement des polices
+    # Chargement des polices (mises en cache pour toute la session)
     try:
-        font = ImageFont.truetype(f"{BASEDIR}/fonts/{title_font}", title_size)
-        font_subtitle = ImageFont.truetype(f"{BASEDIR}/fonts/{subtitle_font}", subtitle_size)
+        font = _get_font(f"{BASEDIR}/fonts/{title_font}", title_size)
+        font_subtitle = _get_font(f"{BASEDIR}/fonts/{subtitle_font}", subtitle_size)
     except:
         font = ImageFont.load_default()
         font_subtitle = ImageFont.load_default()
     
-    # Génération des carrés de couleur
-    for i, (color, rgb) in enumerate(zip(palette.colors, palette_rgb)):
-        # Calcul de la position
-        col = i % columns
-        ligne = i // columns
-        
-        x = col * square_x
-        y = ligne * square_y
-        
-        color_hex = convert_rgb_to_hex(rgb)
-
-        # Dessin du carré de couleur
-        draw.rectangle(
-            [x, y, x + square_x, y + square_y],
-            fill=rgb,
-            outline=color_hex,
-            width=5
-        )
-        
+    # Conversion hexadécimale en une seule passe vectorisée
+    palette_hex = rgb_to_hex_batch(palette_rgb)
+
+    # Génération des carrés de couleur : une grille (lignes, colonnes, 3)
+    # étirée à la taille des carrés en une seule opération NumPy.
+    # Le contour a la même couleur que le remplissage : le carré plein suffit
+    cells = np.full((lines * columns, 3), 255, dtype=np.uint8)
+    cells[:len(palette_rgb)] = palette_rgb
+    grid = cells.reshape(lines, columns, 3)
+    arr = np.repeat(np.repeat(grid, square_y, axis=0), square_x, axis=1)
+
+    image = Image.fromarray(arr)
+    draw = ImageDraw.Draw(image)
+
+    # Positions et couleurs de texte précalculées en une passe vectorisée
+    nb_colors = len(palette_rgb)
+    indices = np.arange(nb_colors)
+    xs = (indices % columns) * square_x
+    ys = (indices // columns) * square_y
+    luminances = palette_rgb @ np.array([0.2126, 0.7152, 0.0722])
+    text_values = np.where(luminances > 200, 0, 255)
+    text_offset_y = min(square_x, square_y) // 2 - title_size // 2
+
+    # Passe texte
+    for i, color in enumerate(palette.colors):
+        x = int(xs[i])
+        y = int(ys[i])
+
+        color_hex = str(palette_hex[i])
+
         # Taille du texte
-        title_length = font.getlength(color_hex)
+        title_length = _get_text_length(font, color_hex)
         # position du texte
         text_x = x + square_x // 2 - title_length // 2
-        if square_x < square_y:
-            text_y = y + square_x // 2 - title_size // 2
-        else:
-            text_y = y + square_y // 2 - title_size // 2
+        text_y = y + text_offset_y
 
         subtitle_text = f"{color.freq*100:.2f}%"
-        subtitle_length = font_subtitle.getlength(subtitle_text)
+        subtitle_length = _get_text_length(font_subtitle, subtitle_text)
         subtitle_x = x + square_x // 2 - subtitle_length // 2
         subtitle_y = text_y + title_size + subtitle_size // 2
 
-        color_text = (0, 0, 0) if color.luminance > 200 else (255, 255, 255)
+        color_text = (int(text_values[i]),) * 3
         draw.text((text_x, text_y), color_hex, fill=color_text, font=font)
         draw.text((subtitle_x, subtitle_y), subtitle_text, fill=color_text, font=font_subtitle)
 
     # image.show()
     return image
 
-def save_palette(palette: Palette, palette_rgb: list, image_path: str) -> str:
+def save_palette(palette: ColorPalette, palette_rgb: list, image_path: str) -> str:
     """Génère et sauvegarde l'image de la palette"""
     _, image_name = get_image_info(image_path)
     image_name = image_name.split('.')[0]
@@ -170,6 +266,13 @@ def save_palette(palette: Palette, palette_rgb: list, image_path: str) -> str:
 
     return file_path
 
+def process_one(image_path: str) -> PaletteObject:
+    """Extrait la palette d'une image et sauvegarde son rendu.
+    Fonction de niveau module pour être exécutable dans un worker."""
+    palette, palette_rgb = get_palette(image_path)
+    palette_path = save_palette(palette=palette, palette_rgb=palette_rgb, image_path=image_path)
+    return PaletteObject(palette=palette, image_path=image_path, palette_path=palette_path)
+
 def palette_info(palette_object: PaletteObject, indice: int, display: bool | None=False) -> None:
     """Affiche les informations sur la palette"""
     palette = palette_object.palette
@@ -185,8 +288,9 @@ def palette_info(palette_object: PaletteObject, indice: int, display: bool | Non
     print(f"Palette path : {palette_path}")
     print()
 
-    for i, (color, rgb) in enumerate(zip(palette.colors, palette_rgb), 1):
-        print(f"{i:2d}.  {rgb} - {('#%02x%02x%02x' % rgb).upper()} - {color.freq*100:.2f}%")
+    palette_hex = rgb_to_hex_batch(palette_rgb)
+    for i, (color, rgb, color_hex) in enumerate(zip(palette.colors, palette_rgb, palette_hex), 1):
+        print(f"{i:2d}.  {tuple(map(int, rgb))} - {color_hex} - {color.freq*100:.2f}%")
 
     print()
     console.rule("", style="bold blue")
@@ -194,41 +298,64 @@ def palette_info(palette_object: PaletteObject, indice: int, display: bool | Non
 
     # show image
     if display:
+        from PIL import Image
+
         image_palette = Image.open(palette_path)
         image = Image.open(image_path)
         image.show()
         image_palette.show()
 
-def get_indice_from_option(image_path: str, palettes_list: PaletteList, all: bool=False) -> int | None:
-    indice_split = image_path.strip().split(' ')
-    if len(indice_split) > 1:
-        if indice_split[1].startswith(("-", "--")):
+# Table de correspondance commande -> action
+COMMANDS = {
+    "exit": 'exit',
+    "h": 'help', "help": 'help',
+    "c": 'config', "config": 'config',
+    "s": 'show', "show": 'show',
+    "csv": 'csv', "json": 'json', "gpl": 'gpl', "aco": 'aco',
+    "l": 'list', "list": 'list',
+    "select": 'select', "multi": 'multi',
+}
+
+# Reconnaissance des commandes en un seul appel C (les noms longs d'abord
+# pour que /show ne soit pas tronqué en /s). Le lookahead exige une espace ou
+# la fin de l'entrée après le nom : un chemin comme /config/app.png n'est pas
+# une commande et retombe sur le traitement des fichiers
+CMD_RE = re.compile(
+    r"^/(?P<cmd>%s)(?=\s|$)(?P<args>.*)$" % "|".join(sorted(COMMANDS, key=len, reverse=True))
+)
+
+def parse_input(user_input: str) -> tuple[str | None, list[str]]:
+    """Reconnaît la commande et ses arguments en une seule passe.
+    Renvoie (None, []) si l'entrée n'est pas une commande connue."""
+    match = CMD_RE.match(user_input.strip())
+    if match is None:
+        return None, []
+    try:
+        args = shlex.split(match.group("args"))
+    except ValueError:
+        args = match.group("args").split()
+    return COMMANDS[match.group("cmd")], args
+
+def get_indice_from_option(args: list[str], palettes_list: PaletteList, all: bool=False) -> int | None:
+    if args:
+        if args[0].startswith(("-", "--")):
             indice = 1
         else:
             if all:
-                if indice_split[1] in ["all", "ALL"]:
+                if args[0] in ["all", "ALL"]:
                     return -1
             try:
-                indice = int(indice_split[1])
+                indice = int(args[0])
             except ValueError:
                 return None
     else:
         indice = 1
-    if indice is None or indice < 1 or indice > len(palettes_list.palettes):
+    if indice < 1 or indice > len(palettes_list.palettes):
         return None
     return indice
 
-def get_display_from_option(image_path: str) -> bool:
-    option_split = image_path.strip().split(' ')
-    if len(option_split) > 1 and option_split[1] in ["-d", "--display"]:
-        return True
-    if len(option_split) > 2 and option_split[2] in ["-d", "--display"]:
-        return True
-    return False
-
-def get_action_from_option(image_path: str) -> str:
-    option_split = image_path.strip().split(' ')
-    return option_split[0][1:]
+def get_display_from_option(args: list[str]) -> bool:
+    return any(arg in ["-d", "--display"] for arg in args[:2])
 
 def export_csv(palettes_list: PaletteList, indice: int = 0) -> None:
     console.rule("Exporting to CSV", style="bold blue")
@@ -266,8 +393,7 @@ def export(exporter: Exporter, palettes_list: PaletteList, indice: int, extensio
         image_name = image_name.split('.')[0]
         file_name = f"{image_name}_palette.{extension}"
         file_path = os.path.join(save_path, file_name)
-        palette_rgb = palette_to_rgb(palette=palette.palette)
-        palette_hex = [convert_rgb_to_hex(tuple(color.rgb)) for color in palette.palette]
+        palette_rgb, palette_hex = palette_to_rgb_hex(palette=palette.palette)
         exporter.export(palette_name=image_name, filepath=file_path, palette_rgb=palette_rgb, palette_hex=palette_hex)
         console.print(f"{index+1:2d} >  Palette exported to {file_name}", style="green")
 
@@ -314,6 +440,8 @@ def print_help(show_palette_max: int=0):
     console.line()
 
 def print_instructions():
+    from rich.markdown import Markdown
+
     console.rule("Utilisation", style="bold blue")
     console.line()
     md = Markdown("""Palettator is a tool that allows you to extract the color palette from an image.
@@ -387,6 +515,8 @@ def print_end():
     
 
 def main():
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn
+
     palettes_list = PaletteList(palettes=[])
 
     print_header()
@@ -402,32 +532,30 @@ def main():
                 indice = 0
                 display = None
                 image_path = input("Option : ")
-                if image_path == "/exit":
+                command, args = parse_input(image_path)
+                if command == 'exit':
                     print()
                     exit()
-                elif image_path in ["/h", "/help"]:
-                    action = 'help'
-                    break
-                elif image_path in ["/c", "/config"]:
-                    action = 'config'
+                elif command in ('help', 'config'):
+                    action = command
                     break
-                elif image_path.startswith(("/s", "/show")):
+                elif command == 'show':
                     action = 'show'
-                    if indice:= get_indice_from_option(image_path, palettes_list):
-                        display = get_display_from_option(image_path)
+                    if indice:= get_indice_from_option(args, palettes_list):
+                        display = get_display_from_option(args)
                         break
                     console.print("Invalid palette index.", style="red")
                     continue
-                elif image_path.startswith(("/csv", "/json", "/gpl", "/aco")):
-                    action = get_action_from_option(image_path)
-                    if indice:= get_indice_from_option(image_path, palettes_list, all=True):
+                elif command in ('csv', 'json', 'gpl', 'aco'):
+                    action = command
+                    if indice:= get_indice_from_option(args, palettes_list, all=True):
                         break
                     console.print("Invalid palette index.", style="red")
                     continue
-                elif image_path.startswith(("/l", "/list")):
+                elif command == 'list':
                     if len(palettes_list.palettes) == 0:
                         console.print("No palette available.", style="red")
-                        continue    
+                        continue
                     action = 'list'
                     break
                 elif os.path.exists(image_path):
@@ -435,13 +563,13 @@ def main():
                         break
                     else:
                         console.print("Only files are allowed.", style="red")
-                elif image_path == "1" or image_path == "/select":
+                elif image_path == "1" or command == 'select':
                     image_path = select_images(multiple=False, title="Choose an image")
                     if image_path is not None:
                         break
                     else:
                         console.print("No file has been selected.", style="red")
-                elif image_path == "2" or image_path == "/multi":
+                elif image_path == "2" or command == 'multi':
                     image_path = select_images(multiple=True, title="Choose one or more images")
                     if image_path is not None:
                         break
@@ -496,20 +624,30 @@ def main():
                 ) as progress:
                 progress_title = f"Extracting palette{'s' if len(images) > 1 else ''}"
                 task = progress.add_task(progress_title, total=len(images))
-                for image_path in images:
-                    palette, palette_rgb = get_palette(image_path)
-                
-                    # Génération et sauvegarde de l'image
+                if len(images) == 1:
+                    # Pas de pool pour une seule image : extraction directe
                     try:
-                        _, image_name = get_image_info(image_path)
-                        palette_path = save_palette(palette=palette, palette_rgb=palette_rgb, image_path=image_path)
-                        palettes_list.palettes.append(PaletteObject(palette=palette, image_path=image_path, palette_path=palette_path))
-                        
+                        palettes_list.palettes.append(process_one(images[0]))
                     except Exception as e:
                         print(f"❌ Error during generation: {e}")
                         print("Check the installation of dependencies")
-                    
                     progress.update(task, advance=1)
+                else:
+                    # Les extractions sont indépendantes : une image par cœur
+                    # Démarrage en mode spawn : fork est incompatible avec les
+                    # threads Numba déjà lancés dans le processus principal
+                    with ProcessPoolExecutor(
+                            max_workers=min(len(images), os.cpu_count() or 1),
+                            mp_context=multiprocessing.get_context("spawn")
+                        ) as executor:
+                        futures = [executor.submit(process_one, image_path) for image_path in images]
+                        for future in futures:
+                            try:
+                                palettes_list.palettes.append(future.result())
+                            except Exception as e:
+                                print(f"❌ Error during generation: {e}")
+                                print("Check the installation of dependencies")
+                            progress.update(task, advance=1)
             
             list_palettes(palettes_list=palettes_list)
 
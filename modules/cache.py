@@ -0,0 +1,70 @@
+"""On-disk cache for extracted palettes.
+
+Re-running the tool over unchanged images skips clustering entirely:
+palettes are stored as small .npz files keyed by the file identity
+(absolute path, mtime, size) and the extraction parameters.
+"""
+
+import hashlib
+import os
+import zipfile
+
+import numpy as np
+
+from modules.kmeans import ColorPalette, PaletteColor
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "palettator")
+
+
+def _cache_path(image_path: str, palette_size: int, resize: int, algorithm: str) -> str:
+    stat = os.stat(image_path)
+    key = "|".join(map(str, (
+        os.path.abspath(image_path),
+        stat.st_mtime_ns,
+        stat.st_size,
+        palette_size,
+        resize,
+        algorithm,
+    )))
+    digest = hashlib.blake2b(key.encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{digest}.npz")
+
+
+def load_or_compute(image_path: str, palette_size: int, resize: int, algorithm: str, compute_fn) -> ColorPalette:
+    """Return the cached palette for an unchanged image, or compute and store it."""
+    try:
+        cache_path = _cache_path(image_path, palette_size, resize, algorithm)
+    except OSError:
+        return compute_fn()
+
+    if os.path.exists(cache_path):
+        try:
+            with np.load(cache_path) as data:
+                return ColorPalette(colors=[
+                    PaletteColor(rgb=rgb, freq=float(freq), luminance=float(luminance))
+                    for rgb, freq, luminance in zip(data["rgb"], data["freq"], data["luminance"])
+                ])
+        except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+            # Corrupt or truncated file: drop it and recompute below
+            try:
+                os.unlink(cache_path)
+            except OSError:
+                pass
+
+    palette = compute_fn()
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write to a sibling temp file and rename atomically so an
+        # interrupted save never leaves a truncated .npz behind
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "wb") as tmp_file:
+            np.savez(
+                tmp_file,
+                rgb=np.asarray([color.rgb for color in palette], dtype=np.uint8),
+                freq=np.asarray([color.freq for color in palette]),
+                luminance=np.asarray([color.luminance for color in palette]),
+            )
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return palette
@@ -1,8 +1,10 @@
 import csv
 import os
 import json
+import struct
 from abc import ABC, abstractmethod
-from math import floor
+
+import numpy as np
 
 class Exporter(ABC):
     """Formatting palette colors to export in a specific format."""
@@ -14,53 +16,52 @@ class Exporter(ABC):
 class ExportToJSon(Exporter):
 
     def export(self, palette_name: str, filepath: str, palette_rgb: list[tuple[int, int, int]], palette_hex: list[str]) -> None:
-        rgb = [(int(color[0]), int(color[1]), int(color[2])) for color in palette_rgb]
+        # tolist() converts numpy scalars to plain ints in C
         output = {
             "name": palette_name,
-            "rgb": rgb,
+            "rgb": np.asarray(palette_rgb, dtype=np.int64).tolist(),
             "hex": palette_hex
-        }  
+        }
         with open(filepath, 'w') as f:
-            json.dump(output, f)
+            f.write(json.dumps(output))
 
 class ExportToCSV(Exporter):
 
     def export(self, palette_name: str, filepath: str, palette_rgb: list[tuple[int, int, int]], palette_hex: list[str]) -> None:
         _ = palette_name
         with open(filepath, 'w', newline='') as csv_file:
-            header = ['R', 'G', 'B', 'HEX']
-            writer = csv.DictWriter(csv_file, fieldnames=header, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-            writer.writeheader()
-            for rgb, hex in zip(palette_rgb, palette_hex):
-                writer.writerow({'R': rgb[0], 'G': rgb[1], 'B': rgb[2], 'HEX': hex})
+            writer = csv.writer(csv_file, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+            writer.writerow(['R', 'G', 'B', 'HEX'])
+            writer.writerows((rgb[0], rgb[1], rgb[2], hex) for rgb, hex in zip(palette_rgb, palette_hex))
 
 
 class ExportToGPL(Exporter):
 
     def export(self, palette_name: str, filepath: str, palette_rgb: list[tuple[int, int, int]], palette_hex: list[str]) -> None:
-        nl = "\n"
-        output = (f"GIMP Palette\n"
-            f"Name: {palette_name}\n"
-            f"Columns: 5\n"
-            f"#\n"
-            f"# Number : {len(palette_rgb)}\n"
-            f"#\n")
-        for i, color in enumerate(palette_rgb):
-            output += f"{color[0]} {color[1]} {color[2]} Index {i}\n"
+        lines = [
+            "GIMP Palette",
+            f"Name: {palette_name}",
+            "Columns: 5",
+            "#",
+            f"# Number : {len(palette_rgb)}",
+            "#",
+        ]
+        lines.extend(f"{color[0]} {color[1]} {color[2]} Index {i}" for i, color in enumerate(palette_rgb))
 
         with open(filepath, 'w') as f:
-            f.write(output)
+            f.write("\n".join(lines) + "\n")
 
 class ExportToACO(Exporter):
 
     def export(self, palette_name: str, filepath: str, palette_rgb: list[tuple[int, int, int]], palette_hex: list[str]) -> None:
-        nb = len(palette_rgb)
-        nb_1 = floor(nb/255)
-        nb_2 = nb%255
+        # ACO v1: version and color count are big-endian uint16,
+        # each color is 5 big-endian uint16 (space, R, G, B, padding)
+        # with the 8-bit channels doubled to 16 bits
+        buf = bytearray(struct.pack(">HH", 1, len(palette_rgb)))
+        for color in palette_rgb:
+            # int() keeps the shifts out of numpy uint8 arithmetic (overflows on << 8)
+            r, g, b = (int(c) for c in color)
+            buf += struct.pack(">HHHHH", 0, r << 8 | r, g << 8 | g, b << 8 | b, 0)
 
         with open(filepath, 'wb') as f:
-            f.write(bytearray([0, 1]))
-            f.write(bytearray([nb_1, nb_2]))
-        
-            for color in palette_rgb:
-                f.write(bytearray([0,0,color[0],color[0],color[1],color[1],color[2],color[2],0,0]))
+            f.write(buf)
@@ -3,10 +3,11 @@ Sélecteur d'images portable avec interface graphique native
 Compatible Windows, macOS, Linux avec fallback
 """
 
+import asyncio
 import os
 import sys
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Callable, List, Optional, Union
 
 class DialogResult:
     """Classe pour distinguer les différents résultats du dialogue"""
@@ -15,28 +16,198 @@ class DialogResult:
         self.cancelled = cancelled  # True si l'utilisateur a annulé
         self.data = data           # Les données sélectionnées
 
+# Instances toolkit réutilisées entre les appels : le démarrage de Tk et de Qt
+# (interpréteur Tcl, scan des plugins et des polices) domine le coût d'ouverture
+_tk_root = None
+_qt_app = None
+
+# Premier backend ayant fonctionné : réutilisé directement aux appels suivants
+# pour ne pas réimporter les toolkits des backends en échec
+_selected_backend = None
+
+# Types de fichiers d'images supportés, construits une seule fois
+_TK_FILETYPES = [
+    ("Images", "*.jpg *.jpeg *.png *.gif *.bmp *.tiff *.webp"),
+    ("JPEG", "*.jpg *.jpeg"),
+    ("PNG", "*.png"),
+    ("GIF", "*.gif")
+]
+_QT_FILTER = "Images (*.jpg *.jpeg *.png *.gif *.bmp *.tiff *.webp)"
+_WIN32_FILTER = "Images\0*.jpg;*.jpeg;*.png;*.gif;*.bmp;*.tiff;*.webp\0"
+_ZENITY_FILTER = '--file-filter=Images | *.jpg *.jpeg *.png *.gif *.bmp *.tiff *.webp'
+
+# Gabarits AppleScript avec emplacement {title}, construits une seule fois
+_APPLESCRIPT_MULTI_TEMPLATE = '''
+            tell application "System Events"
+                set imageFiles to choose file with prompt "{title}" ¬
+                    of type {{"public.image"}} ¬
+                    with multiple selections allowed
+                set filePaths to {{}}
+                repeat with imageFile in imageFiles
+                    set end of filePaths to POSIX path of imageFile
+                end repeat
+                return my list_to_string(filePaths, "|")
+            end tell
+
+            on list_to_string(lst, delim)
+                set AppleScript's text item delimiters to delim
+                set txt to lst as string
+                set AppleScript's text item delimiters to ""
+                return txt
+            end list_to_string
+            '''
+_APPLESCRIPT_SINGLE_TEMPLATE = '''
+            tell application "System Events"
+                set imageFile to choose file with prompt "{title}" ¬
+                    of type {{"public.image"}}
+                return POSIX path of imageFile
+            end tell
+            '''
+
+# Mêmes scripts sous forme "on run argv" : compilables une fois en .scpt,
+# osascript saute alors la phase d'analyse à chaque ouverture
+_APPLESCRIPT_MULTI_ARGV = '''
+on run argv
+    set dialogTitle to item 1 of argv
+    tell application "System Events"
+        set imageFiles to choose file with prompt dialogTitle ¬
+            of type {"public.image"} ¬
+            with multiple selections allowed
+        set filePaths to {}
+        repeat with imageFile in imageFiles
+            set end of filePaths to POSIX path of imageFile
+        end repeat
+    end tell
+    set AppleScript's text item delimiters to "|"
+    set txt to filePaths as string
+    set AppleScript's text item delimiters to ""
+    return txt
+end run
+'''
+_APPLESCRIPT_SINGLE_ARGV = '''
+on run argv
+    set dialogTitle to item 1 of argv
+    tell application "System Events"
+        set imageFile to choose file with prompt dialogTitle ¬
+            of type {"public.image"}
+    end tell
+    return POSIX path of imageFile
+end run
+'''
+
+# multiple -> chemin du .scpt compilé (None si osacompile a échoué)
+_compiled_applescripts = {}
+
+# Répertoire par utilisateur (0700) pour les scripts compilés : un .scpt dans
+# le /tmp partagé pourrait être remplacé par un autre utilisateur local avant
+# son exécution par osascript
+_SCRIPT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "palettator")
+
+def _get_compiled_applescript(multiple: bool) -> Optional[str]:
+    """Compile le script de sélection une seule fois avec osacompile"""
+    if multiple in _compiled_applescripts:
+        return _compiled_applescripts[multiple]
+
+    import subprocess
+    import tempfile
+
+    source = _APPLESCRIPT_MULTI_ARGV if multiple else _APPLESCRIPT_SINGLE_ARGV
+    try:
+        os.makedirs(_SCRIPT_CACHE_DIR, mode=0o700, exist_ok=True)
+        scpt_path = os.path.join(
+            _SCRIPT_CACHE_DIR,
+            f"select_{'multi' if multiple else 'single'}.scpt"
+        )
+        with tempfile.NamedTemporaryFile('w', suffix='.applescript', delete=False) as src:
+            src.write(source)
+        try:
+            result = subprocess.run(['osacompile', '-o', scpt_path, src.name],
+                                    capture_output=True, timeout=30)
+        finally:
+            os.unlink(src.name)
+        _compiled_applescripts[multiple] = scpt_path if result.returncode == 0 else None
+    except Exception:
+        _compiled_applescripts[multiple] = None
+    return _compiled_applescripts[multiple]
+
+if os.name == 'nt':
+    # Structure et pointeurs de fonction construits une seule fois : la
+    # déclaration d'une ctypes.Structure (calcul des offsets des champs) et
+    # l'inférence des signatures sont coûteuses à refaire à chaque appel
+    import ctypes
+    from ctypes import wintypes
+
+    class OPENFILENAME(ctypes.Structure):
+        _fields_ = [
+            ('lStructSize', wintypes.DWORD),
+            ('hwndOwner', wintypes.HWND),
+            ('hInstance', wintypes.HINSTANCE),
+            ('lpstrFilter', wintypes.LPCWSTR),
+            ('lpstrCustomFilter', wintypes.LPWSTR),
+            ('nMaxCustFilter', wintypes.DWORD),
+            ('nFilterIndex', wintypes.DWORD),
+            ('lpstrFile', wintypes.LPWSTR),
+            ('nMaxFile', wintypes.DWORD),
+            ('lpstrFileTitle', wintypes.LPWSTR),
+            ('nMaxFileTitle', wintypes.DWORD),
+            ('lpstrInitialDir', wintypes.LPCWSTR),
+            ('lpstrTitle', wintypes.LPCWSTR),
+            ('Flags', wintypes.DWORD),
+            ('nFileOffset', wintypes.WORD),
+            ('nFileExtension', wintypes.WORD),
+            ('lpstrDefExt', wintypes.LPCWSTR),
+            ('lCustData', wintypes.LPARAM),
+            ('lpfnHook', wintypes.LPVOID),
+            ('lpTemplateName', wintypes.LPCWSTR),
+        ]
+
+    _ole32 = ctypes.windll.ole32
+    _comdlg32 = ctypes.windll.comdlg32
+    _GetOpenFileNameW = _comdlg32.GetOpenFileNameW
+    _GetOpenFileNameW.argtypes = [ctypes.POINTER(OPENFILENAME)]
+    _GetOpenFileNameW.restype = wintypes.BOOL
+    _CommDlgExtendedError = _comdlg32.CommDlgExtendedError
+    _CommDlgExtendedError.argtypes = []
+    _CommDlgExtendedError.restype = wintypes.DWORD
+
+    _COINIT_APARTMENTTHREADED = 0x2
+    _com_initialized = False
+
+    def _ensure_com_initialized():
+        """Initialise COM une seule fois par processus (libéré via atexit)"""
+        global _com_initialized
+        if not _com_initialized:
+            import atexit
+
+            _ole32.CoInitializeEx(None, _COINIT_APARTMENTTHREADED)
+            atexit.register(_ole32.CoUninitialize)
+            _com_initialized = True
+
+def _get_tk_root():
+    """Crée la fenêtre root cachée une seule fois et la réutilise ensuite"""
+    global _tk_root
+    import tkinter as tk
+
+    if _tk_root is None:
+        _tk_root = tk.Tk()
+        _tk_root.withdraw()  # Cacher la fenêtre principale
+    _tk_root.lift()      # Mettre au premier plan
+    _tk_root.attributes('-topmost', True)  # Toujours au-dessus
+    _tk_root.update()
+    return _tk_root
+
 def select_images_tkinter(multiple: bool = True, title: str = "Sélectionner des images") -> DialogResult:
     """
     Sélectionneur d'images utilisant tkinter (inclus dans Python)
     """
     try:
-        import tkinter as tk
         from tkinter import filedialog
-        
-        # Créer une fenêtre root cachée
-        root = tk.Tk()
-        root.withdraw()  # Cacher la fenêtre principale
-        root.lift()      # Mettre au premier plan
-        root.attributes('-topmost', True)  # Toujours au-dessus
-        
-        # Types de fichiers d'images supportés
-        filetypes = [
-            ("Images", "*.jpg *.jpeg *.png *.gif *.bmp *.tiff *.webp"),
-            ("JPEG", "*.jpg *.jpeg"),
-            ("PNG", "*.png"),
-            ("GIF", "*.gif")
-        ]
-        
+
+        # Fenêtre root cachée, partagée entre les appels
+        root = _get_tk_root()
+
+        filetypes = _TK_FILETYPES
+
         try:
             if multiple:
                 files = filedialog.askopenfilenames(
@@ -57,8 +228,8 @@ def select_images_tkinter(multiple: bool = True, title: str = "Sélectionner des
                 else:
                     return DialogResult(True, True, None)  # Annulé par l'utilisateur
         finally:
-            root.destroy()
-            
+            root.withdraw()
+
     except ImportError:
         return DialogResult(False, False, None)  # Échec technique
 
@@ -76,13 +247,16 @@ def select_images_qt(multiple: bool = True, title: str = "Sélectionner des imag
             from PySide2.QtWidgets import QApplication, QFileDialog # type: ignore
             from PySide2.QtCore import Qt # type: ignore
         
+        # Référence module pour que l'application ne soit pas détruite entre
+        # deux ouvertures de dialogue
+        global _qt_app
         app = QApplication.instance()
         if app is None:
             app = QApplication(sys.argv)
-        
-        # Types de fichiers
-        filter_str = "Images (*.jpg *.jpeg *.png *.gif *.bmp *.tiff *.webp)"
-        
+        _qt_app = app
+
+        filter_str = _QT_FILTER
+
         if multiple:
             files, _ = QFileDialog.getOpenFileNames(
                 None,
@@ -109,45 +283,75 @@ def select_images_qt(multiple: bool = True, title: str = "Sélectionner des imag
     except ImportError:
         return DialogResult(False, False, None)  # Échec technique
 
-def select_images_zenity(multiple: bool = True, title: str = "Sélectionner des images") -> DialogResult:
+async def select_images_zenity_async(multiple: bool = True, title: str = "Sélectionner des images",
+                                     on_partial: Optional[Callable[[List[str]], None]] = None) -> DialogResult:
     """
-    Sélectionneur d'images utilisant zenity (Linux uniquement)
+    Sélectionneur d'images utilisant zenity (Linux uniquement).
+    Variante asynchrone : le dialogue ne bloque pas la boucle appelante,
+    qui peut avancer d'autres travaux pendant que l'utilisateur clique.
+    Avec on_partial, les chemins sont lus ligne par ligne et transmis au
+    callback dès leur arrivée pour lancer un préchargement.
     """
     if os.name != 'posix':
         return DialogResult(False, False, None)  # Pas Linux
-        
+
+    cmd = [
+        'zenity', '--file-selection',
+        f'--title={title}',
+        _ZENITY_FILTER
+    ]
+
+    if multiple:
+        cmd.append('--multiple')
+        # Un chemin par ligne pour la lecture incrémentale
+        cmd.append('--separator=\n' if on_partial else '--separator=|')
+
     try:
-        import subprocess
-        
-        cmd = [
-            'zenity', '--file-selection',
-            f'--title={title}',
-            '--file-filter=Images | *.jpg *.jpeg *.png *.gif *.bmp *.tiff *.webp'
-        ]
-        
-        if multiple:
-            cmd.append('--multiple')
-            cmd.append('--separator=|')
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-        
-        if result.returncode == 0:
-            output = result.stdout.strip()
-            if multiple:
-                files = output.split('|') if output else []
-                return DialogResult(True, False, files if files else None)
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            if on_partial:
+                files = []
+                while True:
+                    line = await asyncio.wait_for(proc.stdout.readline(), timeout=300)
+                    if not line:
+                        break
+                    path = line.decode().rstrip('\n')
+                    if path:
+                        files.append(path)
+                        on_partial([path])
+                await asyncio.wait_for(proc.wait(), timeout=300)
+                output = '|'.join(files) if multiple else (files[0] if files else '')
             else:
-                return DialogResult(True, False, output if output else None)
-        elif result.returncode == 1:
-            # Code 1 = annulé par l'utilisateur
-            return DialogResult(True, True, None)
-        else:
-            # Autre code d'erreur = problème technique
+                stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=300)
+                output = stdout.decode().strip()
+        except asyncio.TimeoutError:
+            proc.kill()
             return DialogResult(False, False, None)
-        
-    except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError): # type: ignore
+    except (OSError, FileNotFoundError):
         return DialogResult(False, False, None)  # Échec technique
 
+    if proc.returncode == 0:
+        if multiple:
+            files = output.split('|') if output else []
+            return DialogResult(True, False, files if files else None)
+        else:
+            return DialogResult(True, False, output if output else None)
+    elif proc.returncode == 1:
+        # Code 1 = annulé par l'utilisateur
+        return DialogResult(True, True, None)
+    else:
+        # Autre code d'erreur = problème technique
+        return DialogResult(False, False, None)
+
+def select_images_zenity(multiple: bool = True, title: str = "Sélectionner des images",
+                         on_partial: Optional[Callable[[List[str]], None]] = None) -> DialogResult:
+    """Enveloppe synchrone conservée pour la cascade de backends"""
+    return asyncio.run(select_images_zenity_async(multiple=multiple, title=title, on_partial=on_partial))
+
 def select_images_windows_native(multiple: bool = True, title: str = "Sélectionner des images") -> DialogResult:
     """
     Sélectionneur d'images utilisant les API Windows natives (Windows 10/11)
@@ -163,8 +367,8 @@ def select_images_windows_native(multiple: bool = True, title: str = "Sélection
             import win32con
             import pywintypes
             
-            filter_str = "Images\0*.jpg;*.jpeg;*.png;*.gif;*.bmp;*.tiff;*.webp\0"
-            
+            filter_str = _WIN32_FILTER
+
             try:
                 if multiple:
                     filename, customfilter, flags = win32gui.GetOpenFileNameW(
@@ -212,174 +416,147 @@ def select_images_windows_native(multiple: bool = True, title: str = "Sélection
                     
         except ImportError:
             # win32gui non disponible, essayer COM direct
-            import ctypes
-            from ctypes import wintypes, byref
-            
             # Implementation COM basique (simplifié)
-            ole32 = ctypes.windll.ole32
-            ole32.CoInitialize(None)
-            
-            try:
-                # Pour simplifier, on utilise GetOpenFileName de comdlg32
-                comdlg32 = ctypes.windll.comdlg32
+            _ensure_com_initialized()
+
+            # Pour simplifier, on utilise GetOpenFileName de comdlg32
+            ofn = OPENFILENAME()
+            ofn.lStructSize = ctypes.sizeof(OPENFILENAME)
                 
-                class OPENFILENAME(ctypes.Structure):
-                    _fields_ = [
-                        ('lStructSize', wintypes.DWORD),
-                        ('hwndOwner', wintypes.HWND),
-                        ('hInstance', wintypes.HINSTANCE),
-                        ('lpstrFilter', wintypes.LPCWSTR),
-                        ('lpstrCustomFilter', wintypes.LPWSTR),
-                        ('nMaxCustFilter', wintypes.DWORD),
-                        ('nFilterIndex', wintypes.DWORD),
-                        ('lpstrFile', wintypes.LPWSTR),
-                        ('nMaxFile', wintypes.DWORD),
-                        ('lpstrFileTitle', wintypes.LPWSTR),
-                        ('nMaxFileTitle', wintypes.DWORD),
-                        ('lpstrInitialDir', wintypes.LPCWSTR),
-                        ('lpstrTitle', wintypes.LPCWSTR),
-                        ('Flags', wintypes.DWORD),
-                        ('nFileOffset', wintypes.WORD),
-                        ('nFileExtension', wintypes.WORD),
-                        ('lpstrDefExt', wintypes.LPCWSTR),
-                        ('lCustData', wintypes.LPARAM),
-                        ('lpfnHook', wintypes.LPVOID),
-                        ('lpTemplateName', wintypes.LPCWSTR),
-                    ]
+            buffer_size = 32768 if multiple else 260
+            file_buffer = ctypes.create_unicode_buffer(buffer_size)
                 
-                ofn = OPENFILENAME()
-                ofn.lStructSize = ctypes.sizeof(OPENFILENAME)
+            ofn.lpstrFile = file_buffer
+            ofn.nMaxFile = buffer_size
+            ofn.lpstrFilter = _WIN32_FILTER
+            ofn.lpstrTitle = title
+            ofn.Flags = 0x1000 | 0x4  # OFN_FILEMUSTEXIST | OFN_HIDEREADONLY
                 
-                buffer_size = 32768 if multiple else 260
-                file_buffer = ctypes.create_unicode_buffer(buffer_size)
+            if multiple:
+                ofn.Flags |= 0x200  # OFN_ALLOWMULTISELECT
                 
-                ofn.lpstrFile = file_buffer
-                ofn.nMaxFile = buffer_size
-                ofn.lpstrFilter = "Images\0*.jpg;*.jpeg;*.png;*.gif;*.bmp;*.tiff;*.webp\0"
-                ofn.lpstrTitle = title
-                ofn.Flags = 0x1000 | 0x4  # OFN_FILEMUSTEXIST | OFN_HIDEREADONLY
+            result = _GetOpenFileNameW(ctypes.byref(ofn))
                 
+            if result:
                 if multiple:
-                    ofn.Flags |= 0x200  # OFN_ALLOWMULTISELECT
-                
-                result = comdlg32.GetOpenFileNameW(byref(ofn))
-                
-                if result:
-                    if multiple:
-                        # Parser la sortie multi-sélection
-                        files_str = file_buffer.value
-                        files = files_str.split('\0')
-                        files = [f for f in files if f]  # Enlever les chaînes vides
+                    # Parser la sortie multi-sélection
+                    files_str = file_buffer.value
+                    files = files_str.split('\0')
+                    files = [f for f in files if f]  # Enlever les chaînes vides
                         
-                        if len(files) > 1:
-                            directory = files[0]
-                            result_files = [os.path.join(directory, f) for f in files[1:]]
-                            return DialogResult(True, False, result_files)
-                        elif len(files) == 1:
-                            return DialogResult(True, False, [files[0]])
-                        else:
-                            return DialogResult(True, True, None)
+                    if len(files) > 1:
+                        directory = files[0]
+                        result_files = [os.path.join(directory, f) for f in files[1:]]
+                        return DialogResult(True, False, result_files)
+                    elif len(files) == 1:
+                        return DialogResult(True, False, [files[0]])
                     else:
-                        return DialogResult(True, False, file_buffer.value)
+                        return DialogResult(True, True, None)
                 else:
-                    # Vérifier si c'est une annulation ou une erreur
-                    error_code = ctypes.windll.comdlg32.CommDlgExtendedError()
-                    if error_code == 0:
-                        return DialogResult(True, True, None)  # Annulé par l'utilisateur
-                    else:
-                        return DialogResult(False, False, None)  # Erreur technique
+                    return DialogResult(True, False, file_buffer.value)
+            else:
+                # Vérifier si c'est une annulation ou une erreur
+                error_code = _CommDlgExtendedError()
+                if error_code == 0:
+                    return DialogResult(True, True, None)  # Annulé par l'utilisateur
+                else:
+                    return DialogResult(False, False, None)  # Erreur technique
                         
-            finally:
-                ole32.CoUninitialize()
                 
     except Exception:
         return DialogResult(False, False, None)  # Échec technique
 
-def select_images_applescript(multiple: bool = True, title: str = "Sélectionner des images") -> Optional[Union[str, List[str]]]:
+async def select_images_applescript_async(multiple: bool = True, title: str = "Sélectionner des images") -> Optional[Union[str, List[str]]]:
     """
-    Sélectionneur d'images utilisant AppleScript (macOS uniquement)
+    Sélectionneur d'images utilisant AppleScript (macOS uniquement).
+    Variante asynchrone : osascript tourne sans bloquer la boucle appelante.
     """
     if sys.platform != 'darwin':
         return None
-        
+
+    # Script précompilé si osacompile est disponible, sinon source inline
+    scpt_path = _get_compiled_applescript(multiple)
+    if scpt_path:
+        cmd = ['osascript', scpt_path, title]
+    else:
+        template = _APPLESCRIPT_MULTI_TEMPLATE if multiple else _APPLESCRIPT_SINGLE_TEMPLATE
+        cmd = ['osascript', '-e', template.format(title=title)]
+
     try:
-        import subprocess
-        
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=300)
+        except asyncio.TimeoutError:
+            proc.kill()
+            return None
+    except (OSError, FileNotFoundError):
+        return None
+
+    if proc.returncode == 0:
+        output = stdout.decode().strip()
         if multiple:
-            script = f'''
-            tell application "System Events"
-                set imageFiles to choose file with prompt "{title}" ¬
-                    of type {{"public.image"}} ¬
-                    with multiple selections allowed
-                set filePaths to {{}}
-                repeat with imageFile in imageFiles
-                    set end of filePaths to POSIX path of imageFile
-                end repeat
-                return my list_to_string(filePaths, "|")
-            end tell
-            
-            on list_to_string(lst, delim)
-                set AppleScript's text item delimiters to delim
-                set txt to lst as string
-                set AppleScript's text item delimiters to ""
-                return txt
-            end list_to_string
-            '''
+            return output.split('|') if output else None
         else:
-            script = f'''
-            tell application "System Events"
-                set imageFile to choose file with prompt "{title}" ¬
-                    of type {{"public.image"}}
-                return POSIX path of imageFile
-            end tell
-            '''
-        
-        result = subprocess.run(['osascript', '-e', script], 
-                              capture_output=True, text=True, timeout=300)
-        
-        if result.returncode == 0:
-            output = result.stdout.strip()
-            if multiple:
-                return output.split('|') if output else None
-            else:
-                return output if output else None
-        return None
-        
-    except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
-        return None
+            return output if output else None
+    return None
+
+def select_images_applescript(multiple: bool = True, title: str = "Sélectionner des images") -> Optional[Union[str, List[str]]]:
+    """Enveloppe synchrone conservée pour la cascade de backends"""
+    return asyncio.run(select_images_applescript_async(multiple=multiple, title=title))
 
-def select_images(multiple: bool = True, title: str = "Sélectionner des images") -> Optional[Union[str, List[str]]]:
+def select_images(multiple: bool = True, title: str = "Sélectionner des images",
+                  on_partial: Optional[Callable[[List[str]], None]] = None) -> Optional[Union[str, List[str]]]:
     """
     Fonction principale pour sélectionner des images avec fallback automatique
-    
+
     Args:
         multiple: Si True, permet la sélection multiple
         title: Titre de la fenêtre de dialogue
-        
+        on_partial: Callback recevant les chemins dès qu'ils sont connus,
+            pour démarrer un préchargement (décodage, stat) pendant que le
+            dialogue est encore ouvert lorsque le backend le permet
+
     Returns:
         str ou List[str] selon le mode, None si annulé ou échec
     """
-    
+    global _selected_backend
+
+    memoized = _selected_backend is not None
+    if memoized:
+        # Backend déjà validé : pas de nouvelle cascade d'imports
+        methods = [_selected_backend]
     # Ordre de priorité des méthodes selon l'OS
-    if sys.platform == 'darwin':  # macOS
+    elif sys.platform == 'darwin':  # macOS
         methods = [select_images_applescript, select_images_tkinter, select_images_qt]
     elif os.name == 'posix':      # Linux
         methods = [select_images_zenity, select_images_tkinter, select_images_qt]
     else:                         # Windows
         methods = [select_images_windows_native, select_images_tkinter, select_images_qt]
-    
+
     # Essayer chaque méthode jusqu'à ce qu'une fonctionne techniquement
     for method in methods:
         try:
-            result = method(multiple=multiple, title=title)
-            
+            if method is select_images_zenity:
+                # Seul backend capable de signaler les chemins en cours de route
+                result = method(multiple=multiple, title=title, on_partial=on_partial)
+            else:
+                result = method(multiple=multiple, title=title)
+
             if result.success:
                 # La méthode a fonctionné techniquement
+                _selected_backend = method
                 if result.cancelled:
                     # L'utilisateur a annulé volontairement
                     return None
                 else:
                     # L'utilisateur a sélectionné quelque chose
+                    if on_partial and method is not select_images_zenity and result.data:
+                        # Backends modaux : signaler la sélection dès la fermeture
+                        on_partial(result.data if isinstance(result.data, list) else [result.data])
                     return result.data
             # Si result.success == False, essayer la méthode suivante
             
@@ -387,29 +564,56 @@ def select_images(multiple: bool = True, title: str = "Sélectionner des images"
             print(f"Erreur avec {method.__name__}: {e}", file=sys.stderr)
             continue
     
+    # Le backend mémorisé ne fonctionne plus (zenity désinstallé, affichage
+    # perdu...) : oublier le choix et relancer la cascade complète
+    if memoized:
+        _selected_backend = None
+        return select_images(multiple=multiple, title=title, on_partial=on_partial)
+
     # Si toutes les méthodes échouent techniquement
     print("Erreur: Impossible d'ouvrir le sélecteur de fichiers", file=sys.stderr)
     print("Assurez-vous d'avoir tkinter installé ou installez PyQt5/PySide2", file=sys.stderr)
     return None
 
+_VALID_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp')
+
 def validate_images(file_paths: Union[str, List[str]]) -> List[Path]:
     """
-    Valide que les fichiers sélectionnés sont des images
+    Valide que les fichiers sélectionnés sont des images.
+    Un seul scandir par répertoire au lieu d'un stat par fichier ; la boucle
+    ne manipule que des chaînes, les Path ne sont construits qu'à la fin.
     """
     if isinstance(file_paths, str):
         file_paths = [file_paths]
-    
-    valid_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'}
+
+    entries_by_dir = {}
     valid_files = []
-    
+
     for file_path in file_paths:
-        path = Path(file_path)
-        if path.exists() and path.suffix.lower() in valid_extensions:
-            valid_files.append(path)
+        dirname, name = os.path.split(file_path)
+        # Test d'extension en mémoire d'abord (str.endswith accepte un tuple
+        # et tourne en C) : un nom invalide n'atteint jamais le système de fichiers
+        if not name.lower().endswith(_VALID_EXTENSIONS):
+            print(f"Attention: {file_path} n'est pas une image valide", file=sys.stderr)
+            continue
+
+        entries = entries_by_dir.get(dirname)
+        if entries is None:
+            try:
+                with os.scandir(dirname or '.') as scanner:
+                    entries = {entry.name: entry for entry in scanner}
+            except OSError:
+                entries = {}
+            entries_by_dir[dirname] = entries
+
+        entry = entries.get(name)
+        # is_file() lit l'information déjà en cache dans le DirEntry
+        if entry is not None and entry.is_file():
+            valid_files.append(file_path)
         else:
             print(f"Attention: {file_path} n'est pas une image valide", file=sys.stderr)
-    
-    return valid_files
+
+    return [Path(file_path) for file_path in valid_files]
 
 # Exemple d'utilisation
 if __name__ == "__main__":
@@ -0,0 +1,161 @@
+"""K-means color extraction accelerated with NumPy and Numba.
+
+Replaces the generic Python k-means from Pylette with Lloyd's algorithm
+compiled by Numba (parallel, fastmath). Seeding uses k-means++.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from numba import njit, prange
+
+MAX_ITERS = 30
+LUMINANCE_WEIGHTS = np.array([0.2126, 0.7152, 0.0722])
+
+
+@dataclass
+class PaletteColor:
+    """A single palette entry, mirroring the attributes Pylette exposed."""
+    rgb: np.ndarray
+    freq: float
+    luminance: float
+
+
+@dataclass
+class ColorPalette:
+    """Lightweight palette container, iterable over its colors."""
+    colors: list[PaletteColor]
+
+    def __iter__(self):
+        return iter(self.colors)
+
+    def __len__(self) -> int:
+        return len(self.colors)
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def assign(pixels, centers, labels):
+    """Assign each pixel to its nearest center (squared L2 over 3 channels)."""
+    n = pixels.shape[0]
+    k = centers.shape[0]
+    for i in prange(n):
+        best = 0
+        best_dist = np.inf
+        for j in range(k):
+            dist = 0.0
+            for c in range(3):
+                diff = pixels[i, c] - centers[j, c]
+                dist += diff * diff
+            if dist < best_dist:
+                best_dist = dist
+                best = j
+        labels[i] = best
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def update(pixels, labels, k, sums, counts):
+    """Accumulate per-center channel sums and counts via per-thread partials."""
+    n = pixels.shape[0]
+    n_threads = sums.shape[0]
+    chunk = (n + n_threads - 1) // n_threads
+    for t in prange(n_threads):
+        start = t * chunk
+        stop = min(start + chunk, n)
+        for i in range(start, stop):
+            j = labels[i]
+            counts[t, j] += 1
+            for c in range(3):
+                sums[t, j, c] += pixels[i, c]
+
+
+def _kmeans_pp_init(pixels: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    """k-means++ seeding: spread initial centers proportionally to distance."""
+    n = pixels.shape[0]
+    centers = np.empty((k, 3), dtype=np.float64)
+    centers[0] = pixels[rng.integers(n)]
+    dist = np.full(n, np.inf)
+    for j in range(1, k):
+        diff = pixels - centers[j - 1]
+        np.minimum(dist, np.einsum('ij,ij->i', diff, diff), out=dist)
+        total = dist.sum()
+        if total <= 0:
+            centers[j:] = pixels[rng.integers(n, size=k - j)]
+            break
+        centers[j] = pixels[np.searchsorted(np.cumsum(dist), rng.random() * total)]
+    return centers
+
+
+def kmeans_palette(image_path: str, k: int) -> ColorPalette:
+    """Extract a k-color palette from an image, sorted by luminance."""
+    from PIL import Image
+
+    with Image.open(image_path) as img:
+        pixels = np.asarray(img.convert('RGB'), dtype=np.uint8).reshape(-1, 3)
+
+    return kmeans_palette_from_pixels(pixels, k)
+
+
+def kmeans_palette_from_pixels(pixels: np.ndarray, k: int) -> ColorPalette:
+    """Run Lloyd's algorithm on a flat (N, 3) uint8 pixel array."""
+    pixels = np.ascontiguousarray(pixels.reshape(-1, 3), dtype=np.float64)
+    n = pixels.shape[0]
+    k = min(k, n)
+
+    rng = np.random.default_rng(0)
+    centers = _kmeans_pp_init(pixels, k, rng)
+    labels = np.empty(n, dtype=np.int64)
+
+    import numba
+    n_threads = numba.get_num_threads()
+
+    counts = np.zeros(k, dtype=np.int64)
+    for _ in range(MAX_ITERS):
+        assign(pixels, centers, labels)
+        sums = np.zeros((n_threads, k, 3), dtype=np.float64)
+        partial_counts = np.zeros((n_threads, k), dtype=np.int64)
+        update(pixels, labels, k, sums, partial_counts)
+        counts = partial_counts.sum(axis=0)
+        new_centers = sums.sum(axis=0)
+        empty = counts == 0
+        # Reseed empty clusters on a random pixel to keep k colors
+        new_centers[~empty] /= counts[~empty, None]
+        new_centers[empty] = pixels[rng.integers(n, size=int(empty.sum()))]
+        if np.allclose(new_centers, centers):
+            centers = new_centers
+            break
+        centers = new_centers
+
+    rgb = np.clip(np.rint(centers), 0, 255).astype(np.uint8)
+    return _build_palette(rgb, counts / n)
+
+
+def quantize_palette_from_pixels(pixels: np.ndarray, k: int) -> ColorPalette:
+    """Extract a palette with Pillow's C quantizer (libimagequant).
+
+    Falls back to the Numba k-means when Pillow was built without
+    libimagequant support.
+    """
+    from PIL import Image
+
+    pixels = np.ascontiguousarray(pixels.reshape(-1, 3), dtype=np.uint8)
+    img = Image.fromarray(pixels.reshape(1, -1, 3))
+    try:
+        quantized = img.quantize(colors=k, method=Image.Quantize.LIBIMAGEQUANT)
+    except ValueError:
+        return kmeans_palette_from_pixels(pixels, k)
+
+    labels = np.asarray(quantized).ravel()
+    counts = np.bincount(labels)
+    rgb = np.asarray(quantized.getpalette()[:3 * counts.shape[0]], dtype=np.uint8).reshape(-1, 3)
+    return _build_palette(rgb, counts / labels.shape[0])
+
+
+def _build_palette(rgb: np.ndarray, freq: np.ndarray) -> ColorPalette:
+    """Wrap rgb/freq arrays in a ColorPalette sorted by luminance."""
+    luminance = rgb @ LUMINANCE_WEIGHTS
+    order = np.argsort(luminance)
+    colors = [
+        PaletteColor(rgb=rgb[i], freq=float(freq[i]), luminance=float(luminance[i]))
+        for i in order
+    ]
+    return ColorPalette(colors=colors)